@@ -1,6 +1,8 @@
-import os
-from struct import unpack
-from typing import BinaryIO, Dict, TYPE_CHECKING
+import mmap
+import threading
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from anthemtool.structs import U16_BE
 
 if TYPE_CHECKING:
     from anthemtool.package import Package
@@ -20,33 +22,37 @@ class Cas:
         self.package = package
         self.path = path
 
+        # Handle is fetched from the CasCache on first access
+        self._handle: Optional[mmap.mmap] = None
+
     def has_file_at(self, offset: int) -> bool:
         """
         Determine if the start of a file part exists at the given offset.
         """
-        handle = self.handle
-        handle.seek(offset + 0x4)
-        magic = unpack(">H", handle.read(2))[0]
+        # The compression magic follows the size in each file part header
+        magic = U16_BE.unpack_from(self.handle, offset + 0x4)[0]
 
         return magic in (0x70, 0x71, 0x1170)
 
     @property
-    def handle(self) -> BinaryIO:
+    def handle(self) -> mmap.mmap:
         """
         Fetch the file handle from the CasCache.
         Decoupling file handles allows for serialization to support caching.
         """
-        return CasCache.get_cas_handle(self.path)
+        if self._handle is None:
+            self._handle = CasCache.get_cas_handle(self.path)
 
-    @staticmethod
-    def is_valid_cas_file(path: str) -> bool:
+        return self._handle
+
+    def __getstate__(self) -> Dict[str, Any]:
         """
-        Determine if the given file path is an actual CAS file.
+        Leave out the file handle when serializing, it is fetched again when needed.
         """
-        if not os.path.isfile(path):
-            return False
+        state = self.__dict__.copy()
+        state['_handle'] = None
 
-        return path.endswith('.cas')
+        return state
 
     def __str__(self) -> str:
         return self.path
@@ -55,16 +61,24 @@ class Cas:
 class CasCache:
     """
     Holds a cache of CAS file handles to allow for easy re-use.
+    The CAS files are memory mapped so small reads do not require any system calls.
     """
 
-    handles: Dict[str, BinaryIO] = {}
+    handles: Dict[str, mmap.mmap] = {}
+    lock = threading.Lock()
 
     @staticmethod
-    def get_cas_handle(path: str) -> BinaryIO:
+    def get_cas_handle(path: str) -> mmap.mmap:
         """
         Get a file handle to the given CAS path, or create it if it does not yet exist.
         """
-        if path not in CasCache.handles.keys():
-            CasCache.handles[path] = open(path, "rb")
+        if path not in CasCache.handles:
+            # Handles are shared between threads, make sure each file is only mapped once
+            with CasCache.lock:
+                if path not in CasCache.handles:
+                    with open(path, "rb") as handle:
+                        CasCache.handles[path] = mmap.mmap(
+                            handle.fileno(), 0, access=mmap.ACCESS_READ
+                        )
 
         return CasCache.handles[path]
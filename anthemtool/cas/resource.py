@@ -1,4 +1,3 @@
-import binascii
 from uuid import UUID
 from typing import Optional
 
@@ -11,6 +10,10 @@ class File:
     Base for all data files that reside in CAS files.
     """
 
+    # Files are created for every bundle entry, slots keep their memory footprint small
+    __slots__ = ('cas', 'name', 'sha1', 'flags', 'offset', 'size', 'orig_size', 'sha1_hex',
+                 '_filename')
+
     def __init__(self,
                  sha1: Optional[bytes] = None,
                  cas: Optional[Cas] = None,
@@ -29,39 +32,46 @@ class File:
         self.offset = offset
         self.size = size
         self.orig_size = orig_size
+        self.sha1_hex: Optional[str] = sha1.hex() if sha1 else None
+
+        # Filename is created on first access
+        self._filename: Optional[str] = None
 
     def _format(self) -> str:
         """
         Create a human readable representation of this instance.
         """
-        value = 'name={}, cas={}, sha1=0x{}, offset=0x{:x}, ' \
-                'size=0x{:x}, orig_size=0x{:x}, flags=0x{:x}'
+        cas = self.cas.path if self.cas else None
 
-        return value.format(
-            self.name,
-            self.cas.path if self.cas else None,
-            binascii.hexlify(self.sha1).decode('utf-8') if self.sha1 else '0',
-            self.offset or 0x0,
-            self.size or 0x0,
-            self.orig_size or 0x0,
-            self.flags or 0x0,
-        )
+        return f'name={self.name}, cas={cas}, sha1=0x{self.sha1_hex or "0"}, ' \
+               f'offset=0x{self.offset or 0x0:x}, size=0x{self.size or 0x0:x}, ' \
+               f'orig_size=0x{self.orig_size or 0x0:x}, flags=0x{self.flags or 0x0:x}'
 
     @property
     def filename(self) -> str:
         """
         Get the filename that represents this instance.
+        The result is cached as it is requested multiple times during export.
+        """
+        if self._filename is None:
+            self._filename = self._create_filename()
+
+        return self._filename
+
+    def _create_filename(self) -> str:
+        """
+        Create the filename that represents this instance.
         """
         if self.name:
             return self.name + ".bin"
 
-        if self.sha1:
-            return binascii.hexlify(self.sha1).decode('utf-8') + ".bin"
+        if self.sha1_hex:
+            return self.sha1_hex + ".bin"
 
         raise Exception("Could not produce a unique filename for {}".format(self))
 
     def __repr__(self) -> str:
-        return '{}({})'.format(self.__class__.__name__, self._format())
+        return f'{self.__class__.__name__}({self._format()})'
 
 
 class Ebx(File):
@@ -69,15 +79,19 @@ class Ebx(File):
     Ebx data file. Commonly referenced in bundles.
     """
 
-    @property
-    def filename(self) -> str:
+    __slots__ = ()
+
+    def _create_filename(self) -> str:
         """
-        Get the filename that represents this instance.
+        Create the filename that represents this instance.
         """
         if self.name:
             return self.name + '.ebx'
 
-        return super().filename
+        if self.sha1_hex:
+            return self.sha1_hex + '.bin'
+
+        return super()._create_filename()
 
 
 class Resource(File):
@@ -85,6 +99,8 @@ class Resource(File):
     Resource is a data file that provides additional content type information.
     """
 
+    __slots__ = ('content_type_id', 'meta', 'rid')
+
     def __init__(self,
                  sha1: Optional[bytes] = None,
                  cas: Optional[Cas] = None,
@@ -109,18 +125,17 @@ class Resource(File):
         """
         Find the content type based on the content type id.
         """
-        if self.content_type_id and self.content_type_id in RESOURCE_TYPES.keys():
+        if self.content_type_id and self.content_type_id in RESOURCE_TYPES:
             return RESOURCE_TYPES[self.content_type_id]
 
         return None
 
-    @property
-    def filename(self) -> str:
+    def _create_filename(self) -> str:
         """
-        Get the filename that represents this instance.
+        Create the filename that represents this instance.
         """
-        name = self.name or binascii.hexlify(self.sha1).decode('utf-8')
-        ext = self.content_type or '.res_{:x}'.format(self.content_type_id or 0x0)
+        name = self.name or self.sha1_hex
+        ext = self.content_type or f'.res_{self.content_type_id or 0x0:x}'
 
         return name + ext
 
@@ -128,16 +143,11 @@ class Resource(File):
         """
         Create a human readable representation of this instance.
         """
-        value = ', content_type_id=0x{:x}. content_type={}, meta=0x{:s}, rid=0x{:x}'
+        meta = (self.meta.strip(b'\x00') or b'\x00').hex() if self.meta else '0'
 
-        return super()._format() + value.format(
-            self.content_type_id or 0x0,
-            self.content_type,
-            binascii.hexlify(
-                self.meta.strip(b'\x00') or b'\x00'
-            ).decode('utf-8') if self.meta else '0',
-            self.rid or 0x0,
-        )
+        return super()._format() + \
+            f', content_type_id=0x{self.content_type_id or 0x0:x}. ' \
+            f'content_type={self.content_type}, meta=0x{meta}, rid=0x{self.rid or 0x0:x}'
 
 
 class TocResource(File):
@@ -145,6 +155,8 @@ class TocResource(File):
     TocResource is a data file with an identifier and not tied to a bundle.
     """
 
+    __slots__ = ('uid', '_guid')
+
     def __init__(self,
                  uid,
                  sha1: Optional[bytes] = None,
@@ -160,17 +172,29 @@ class TocResource(File):
         super().__init__(sha1, cas, name, flags, offset, size, orig_size)
         self.uid = uid
 
+        # GUID is created on first access
+        self._guid: Optional[UUID] = None
+
     @property
     def guid(self) -> UUID:
         """
         Get the GUID for this instance.
         """
+        if self._guid is None:
+            self._guid = self._create_guid()
+
+        return self._guid
+
+    def _create_guid(self) -> UUID:
+        """
+        Create the GUID for this instance.
+        The identifier is stored reversed, this does not match the byte order used by chunks.
+        """
         return UUID(bytes_le=self.uid[::-1])
 
-    @property
-    def filename(self) -> str:
+    def _create_filename(self) -> str:
         """
-        Get the filename that represents this instance.
+        Create the filename that represents this instance.
         """
         return str(self.guid) + ".chunk"
 
@@ -178,9 +202,7 @@ class TocResource(File):
         """
         Create a human readable representation of this instance.
         """
-        value = 'guid=0x{:s}, '
-
-        return value.format(str(self.guid)) + super()._format()
+        return f'guid=0x{self.guid}, ' + super()._format()
 
 
 class Chunk(TocResource):
@@ -188,6 +210,8 @@ class Chunk(TocResource):
     Chunk is a data file with an identifier instead of a filename.
     """
 
+    __slots__ = ('range_start', 'logical_size', 'logical_offset', 'h32', 'first_mip')
+
     def __init__(self,
                  uid: bytes,
                  range_start: int,
@@ -225,22 +249,17 @@ class Chunk(TocResource):
         """
         return
 
-    @property
-    def guid(self) -> UUID:
+    def _create_guid(self) -> UUID:
+        """
+        Create the GUID for this instance.
+        """
         return UUID(bytes=self.uid)
 
     def _format(self) -> str:
         """
         Create a human readable representation of this instance.
         """
-        value = 'range_start=0x{:x}, logical_size=0x{:x}, ' \
-                'logical_offset=0x{:x}, h32=0x{:x}, first_mip=0x{:x}, '
-
-        return value.format(
-            self.range_start,
-            self.logical_size,
-            self.logical_offset,
-            self.h32 or 0x0,
-            self.first_mip or 0x0,
-        ) + super()._format()
+        return f'range_start=0x{self.range_start:x}, logical_size=0x{self.logical_size:x}, ' \
+               f'logical_offset=0x{self.logical_offset:x}, h32=0x{self.h32 or 0x0:x}, ' \
+               f'first_mip=0x{self.first_mip or 0x0:x}, ' + super()._format()
 
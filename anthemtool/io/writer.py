@@ -1,6 +1,7 @@
 import logging
+import mmap
 
-from struct import unpack
+from struct import Struct
 from typing import Optional, Dict
 
 from anthemtool.cas.cas import Cas
@@ -10,6 +11,9 @@ from anthemtool.util import PathUtil
 
 LOG = logging.getLogger(__name__)
 
+# Each file part starts with the size, compression magic and compressed size
+PART_HEADER = Struct(">IHH")
+
 
 class CasWriter:
     """
@@ -22,12 +26,21 @@ class CasWriter:
         0x1170: 'oodle',
     }
 
+    # Output files of at least this size are written without an intermediate buffer
+    UNBUFFERED_WRITE_SIZE = 0x10000
+
     def __init__(self, decompressors: Dict[str, Decompressor]) -> None:
         """
         Initialize instance.
         """
         self.decompressors = decompressors
 
+        # Resolve the decompressor for each magic once, so the write loop needs a single lookup
+        self.magic_decompressors: Dict[int, Decompressor] = {
+            magic: decompressors[key]
+            for magic, key in self.DECOMPRESSION_LOOKUP.items() if key in decompressors
+        }
+
     def write(self, cas: Cas, offset: int, path: str, compressed_file_size: int,
               file_size: Optional[int] = None) -> None:
         """
@@ -41,20 +54,33 @@ class CasWriter:
         PathUtil.ensure_base_path_exists(path)
 
         result_size = 0
-        payload_size = 0
 
-        # Get CAS file handle
+        # Get CAS file handle, parts are addressed by position so the handle is never seeked
         handle = cas.handle
-        handle.seek(offset)
-
-        # Open output file for writing
-        with open(path, "wb") as dst:
+        position = offset
+        end = offset + compressed_file_size
+
+        # Let the OS read the whole entry ahead instead of faulting in the parts one by one
+        if hasattr(mmap, 'MADV_WILLNEED'):
+            start = offset - offset % mmap.PAGESIZE
+            handle.madvise(mmap.MADV_WILLNEED, start, end - start)
+
+        # Large files consist of large parts which do not benefit from an output buffer
+        if file_size is not None and file_size >= self.UNBUFFERED_WRITE_SIZE:
+            buffering = 0
+        else:
+            buffering = -1
+
+        # Open output file for writing, uncompressed parts are copied from a view on the CAS file
+        with open(path, "wb", buffering=buffering) as dst, memoryview(handle) as view:
+            # The loop runs for every part, so avoid repeated attribute lookups
+            unpack_header = PART_HEADER.unpack_from
+            write = dst.write
 
             # Read until we reached the given compressed size
-            while payload_size < compressed_file_size:
-                size = unpack(">I", handle.read(4))[0]
-                magic = unpack(">H", handle.read(2))[0]
-                compressed_size = unpack(">H", handle.read(2))[0]
+            while position < end:
+                size, magic, compressed_size = unpack_header(handle, position)
+                position += 8
 
                 # LOG.debug(
                 #     "Writing part size=0x%x outsize=0x%x magic=0x%x",
@@ -64,7 +90,13 @@ class CasWriter:
                 # Determine how to read based on the magic
                 if magic == 0x1170:
                     # Oodle compression, read the compressed size
-                    payload = handle.read(compressed_size)
+                    payload = handle[position:position + compressed_size]
+
+                    # Invoke the appropriate decompressor
+                    decompressor = (
+                        self.magic_decompressors.get(magic) or self.get_decompressor(magic)
+                    )
+                    data = decompressor.decompress(payload, compressed_size, size)
 
                 elif magic in (0x70, 0x71):
                     # We are not sure about these, but they appear to be parts that
@@ -82,8 +114,8 @@ class CasWriter:
                             "Expected outsize=0x{:x} to be zero".format(compressed_size)
                         )
 
-                    # Read uncompressed size
-                    payload = handle.read(size)
+                    # Pass the uncompressed size through without copying it into a new object
+                    payload = data = view[position:position + size]
 
                 else:
                     # Other compression algorithms are not supported
@@ -95,23 +127,24 @@ class CasWriter:
                         )
                     )
 
-                # Invoke the appropriate decompressor
-                decompressor = self.get_decompressor(magic)
-                data = decompressor.decompress(payload, compressed_size, size)
-
                 # Increment counters to keep track of progress
+                position += len(payload)
                 result_size += len(data)
-                payload_size += len(payload) + 8
 
-                # Write the result to the disk
-                dst.write(data)
+                # Write the result to the disk, unbuffered writes may accept only part of
+                # the data so keep writing the remainder until everything is written
+                remaining = memoryview(data)
+                while remaining:
+                    remaining = remaining[write(remaining):]
 
                 # LOG.debug(
                 #     "File part written payload_size=0x%x total_payload_size=0x%x "
                 #     "data_size=0x%x total_data_size=0x%x",
-                #     len(payload), payload_size, len(data), result_size
+                #     len(payload), position - offset, len(data), result_size
                 # )
 
+        payload_size = position - offset
+
         # LOG.debug(
         #     "Finished decompression payload_size=0x%x data_size=0x%x", payload_size, result_size
         # )
@@ -136,11 +169,11 @@ class CasWriter:
         """
         Get the decompressor for the given magic.
         """
-        if magic not in self.DECOMPRESSION_LOOKUP.keys():
+        if magic not in self.DECOMPRESSION_LOOKUP:
             raise Exception("No decompression mapping defined for magic 0x{:x}".format(magic))
 
         key = self.DECOMPRESSION_LOOKUP[magic]
-        if key not in self.decompressors.keys():
+        if key not in self.decompressors:
             raise Exception("No decompression implementation found for key {}".format(key))
 
         return self.decompressors[key]
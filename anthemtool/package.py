@@ -1,5 +1,7 @@
 import logging
+import mmap
 import os
+from io import BytesIO
 from typing import Optional, List, Dict, TYPE_CHECKING
 
 from anthemtool.cas.cas import Cas
@@ -34,8 +36,13 @@ class Package:
         self.path = path
         self.parent = parent
 
+        # Resolve the root folders once, they are used for all bundles and CAS files
+        self.layout_root = os.path.join(layout.game.path, layout.path)
+        self.package_root = os.path.join(self.layout_root, path)
+
         # Local entries
         self.cas_files: Dict[int, Cas] = {}
+        self.cas_lookup: Dict[int, Cas] = {}
         self.superbundles: Dict[str, Optional[TocIndex]] = {}
         self.splitsuperbundles: Dict[str, Optional[TocIndex]] = {}
 
@@ -48,21 +55,20 @@ class Package:
         """
         Initialize the given bundles and discover all CAS files.
         """
-        package_root = os.path.join(self.layout.game.path, self.layout.path, self.path)
-        if not os.path.exists(package_root):
-            LOG.warning("Package %s unavailable", package_root)
+        if not os.path.exists(self.package_root):
+            LOG.warning("Package %s unavailable", self.package_root)
             return
 
-        LOG.debug("Loading package from %s", package_root)
+        LOG.debug("Loading package from %s", self.package_root)
 
         # Load CAS files if they exist
-        self.cas_files = self.get_cas_files(package_root)
+        self.cas_files = self.get_cas_files(self.package_root)
 
         # Splitsuperbundles exist in the same folder as the current package
         if splitsuperbundles:
             for splitsuperbundle in splitsuperbundles:
                 name = splitsuperbundle[len('Win32/'):]
-                bundle_path = os.path.join(package_root, name)
+                bundle_path = os.path.join(self.package_root, name)
 
                 LOG.debug("Initializing split superbundle %s", bundle_path)
                 self.splitsuperbundles[splitsuperbundle] = self.load_bundle(bundle_path)
@@ -70,7 +76,7 @@ class Package:
         # Superbundles are located in the root of the layout folder
         if superbundles:
             for superbundle in superbundles:
-                bundle_path = os.path.join(self.layout.game.path, self.layout.path, superbundle)
+                bundle_path = os.path.join(self.layout_root, superbundle)
 
                 LOG.debug("Initializing superbundle %s", bundle_path)
                 self.superbundles[superbundle] = self.load_bundle(bundle_path)
@@ -87,17 +93,23 @@ class Package:
         LOG.debug("Loading index and superbundle %s", path)
 
         toc_file = TocFile(path + ".toc")
-        if not toc_file.data:
+        if toc_file.data is None:
             raise Exception("Could not read data from bundle")
 
-        bundle = open(path + ".sb", "rb")
-        return TocIndex(self, bundle, toc_file.data)
+        # Bundles are read at the offsets listed in the index, so map the superbundle into memory
+        # instead of reading it through a file buffer. Empty files cannot be mapped.
+        with open(path + ".sb", "rb") as handle:
+            if not os.fstat(handle.fileno()).st_size:
+                return TocIndex(self, handle, BytesIO(toc_file.data))
+
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as bundle:
+                return TocIndex(self, bundle, BytesIO(toc_file.data))
 
     def has_package(self, idx: int) -> bool:
         """
         Determine if a package with the given id exists.
         """
-        return idx == self.idx or idx in self.layout.packages.keys()
+        return idx == self.idx or idx in self.layout.packages
 
     def get_package(self, idx: int, is_patch: bool) -> 'Package':
         """
@@ -116,6 +128,20 @@ class Package:
     def get_cas(self, value: int) -> Optional[Cas]:
         """
         Fetch the CAS file for the given CAS identifier.
+        Bundles reference the same few identifiers for all their entries, so found CAS files
+        are cached. Misses are not, packages that are loaded later may provide the CAS file.
+        """
+        cas = self.cas_lookup.get(value)
+        if cas is None:
+            cas = self.find_cas(value)
+            if cas is not None:
+                self.cas_lookup[value] = cas
+
+        return cas
+
+    def find_cas(self, value: int) -> Optional[Cas]:
+        """
+        Find the CAS file for the given CAS identifier.
         """
         package_index = value >> 8 & 0xFF
         cas_index = value & 0xFF
@@ -131,7 +157,7 @@ class Package:
             return None
 
         package = self.get_package(package_index, is_patch == 0x1)
-        if cas_index not in package.cas_files.keys():
+        if cas_index not in package.cas_files:
             return None
 
         return package.cas_files[cas_index]
@@ -140,10 +166,11 @@ class Package:
         """
         Discover the CAS files for the given path by traversing the directory structure.
         """
-        cas_files = [
-            Cas(self, os.path.join(path, f))
-            for f in os.listdir(path) if Cas.is_valid_cas_file(os.path.join(path, f))
-        ]
+        with os.scandir(path) as entries:
+            cas_files = [
+                Cas(self, entry.path)
+                for entry in entries if entry.name.endswith('.cas') and entry.is_file()
+            ]
 
         # Extract cas index from path to use as key
         return {int(cas.path[-6:-4]): cas for cas in cas_files}
@@ -1,9 +1,11 @@
 import logging
-from struct import unpack
-from typing import List, Any, BinaryIO, Tuple, TYPE_CHECKING
+from struct import Struct
+from typing import List, Any, BinaryIO, Dict, Optional, Tuple, TYPE_CHECKING
 
+from anthemtool.cas.cas import Cas
 from anthemtool.cas.resource import Ebx, Resource, Chunk, File
-from anthemtool.toc.entry import TocEntry
+from anthemtool.structs import U32_BE, U64_BE
+from anthemtool.toc.entry import FIELD_READERS
 from anthemtool.util import ReadUtil
 
 if TYPE_CHECKING:
@@ -12,6 +14,18 @@ if TYPE_CHECKING:
 
 LOG = logging.getLogger(__name__)
 
+# Container magic, unknown and length followed by count, offsets and padding
+CONTAINER_HEADER = Struct(">3I")
+
+# Bundle magic, entry counts and offsets, see Header
+BUNDLE_HEADER = Struct(">8I")
+
+# Name offset and original size of ebx and resource entries
+FILE_ENTRY = Struct(">II")
+
+# Identifier, range start, logical size and logical offset of chunk entries
+CHUNK_ENTRY = Struct(">16sHHI")
+
 
 class SBBundle:
     """
@@ -54,89 +68,111 @@ class SBBundle:
     def read(self, bundle: BinaryIO, offset: int) -> None:
         """
         Read from the given superbundle (.sb) file handle and parse it.
+        The bundle is read with a single call and parsed from memory.
         During parsing some extra checks make sure the parsing is performed correctly.
         """
         LOG.debug("Reading bundle {} at offset 0x{:x}".format(self.name, offset))
         bundle.seek(offset)
 
         # Parse container data
-        magic = unpack(">I", bundle.read(4))[0]
+        magic, _, bundle_len = CONTAINER_HEADER.unpack(bundle.read(CONTAINER_HEADER.size))
         if magic != 0x20:
             raise Exception("Expected TocIndex magic 0x20 but got 0x{:x}".format(magic))
 
-        bundle.read(4)  # unknown
-        bundle_len = unpack(">I", bundle.read(4))[0]
-        bundle.read(4)  # count
-        bundle.read(4)  # offset 1
-        bundle.read(4)  # offset 2
-        bundle.read(4)  # offset 3
-        bundle.read(4)  # padding
+        # Read the whole bundle, it is parsed from memory
+        bundle.seek(offset)
+        data = bundle.read(bundle_len)
+
+        # Skip container count, offsets and padding
+        pos = 0x20
 
         # Parse bundle data
-        meta_size = unpack(">I", bundle.read(4))[0]
-        meta_offset = bundle.tell()
-        header = Header(unpack(">8I", bundle.read(32)))
+        meta_size = U32_BE.unpack_from(data, pos)[0]
+        meta_offset = pos + 4
+        header = Header(BUNDLE_HEADER.unpack_from(data, meta_offset))
         if header.magic != 0x9D798ED6:
             raise Exception("Invalid bundle magic")
 
+        pos = meta_offset + BUNDLE_HEADER.size
         string_offset = meta_offset + header.string_offset
 
         # SHA1 hashes for all entries
-        sha1_entries = [bundle.read(20) for i in range(header.total)]
+        if header.total < header.ebx + header.resources + header.chunks:
+            raise Exception("Bundle contains less SHA1 hashes than entries")
+
+        sha1_entries = [data[p:p + 20] for p in range(pos, pos + 20 * header.total, 20)]
+        ebx_sha1_entries = sha1_entries[:header.ebx]
+        resource_sha1_entries = sha1_entries[header.ebx:header.ebx + header.resources]
+        chunk_sha1_entries = sha1_entries[header.ebx + header.resources:]
+        pos += 20 * header.total
+
+        # The entry tables are unpacked as a whole from views on the data
+        view = memoryview(data)
+
+        # Names are looked up in a decoded string table, offsets that do not point to the start
+        # of a string in the table are read from the data
+        names = self.read_string_table(data, string_offset, meta_offset + meta_size)
+        unpack_string = ReadUtil.unpack_string
 
         # Parse ebx entries
+        ebx_entries = FILE_ENTRY.iter_unpack(view[pos:pos + 8 * header.ebx])
+        pos += 8 * header.ebx
+
         self.ebx = [
             Ebx(
-                sha1=sha1_entries[i],
-                name=ReadUtil.read_string_rewind(
-                    bundle, string_offset + unpack(">I", bundle.read(4))[0]
+                sha1=sha1,
+                name=(
+                    names.get(name_offset) or unpack_string(data, string_offset + name_offset)[0]
                 ),
-                orig_size=unpack(">I", bundle.read(4))[0],
+                orig_size=orig_size,
             )
-            for i in range(header.ebx)
+            for sha1, (name_offset, orig_size) in zip(ebx_sha1_entries, ebx_entries)
         ]
 
-        # Parse resource entries that have provide additional info
+        # Parse resource entries and the additional resource information, the columns are
+        # unpacked first so every resource is created with all of its fields at once
+        resource_entries = FILE_ENTRY.iter_unpack(view[pos:pos + 8 * header.resources])
+        pos += 8 * header.resources
+
+        content_type_ids = U32_BE.iter_unpack(view[pos:pos + 4 * header.resources])
+        pos += 4 * header.resources
+
+        metas = [data[p:p + 16] for p in range(pos, pos + 16 * header.resources, 16)]
+        pos += 16 * header.resources
+
+        rids = U64_BE.iter_unpack(view[pos:pos + 8 * header.resources])
+        pos += 8 * header.resources
+
         self.resources = [
             Resource(
-                sha1=sha1_entries[len(self.ebx) + i],
-                name=ReadUtil.read_string_rewind(
-                    bundle, string_offset + unpack(">I", bundle.read(4))[0]
+                sha1=sha1,
+                name=(
+                    names.get(name_offset) or unpack_string(data, string_offset + name_offset)[0]
                 ),
-                orig_size=unpack(">I", bundle.read(4))[0],
+                orig_size=orig_size,
+                content_type_id=content_type_id,
+                meta=meta,
+                rid=rid,
+            )
+            for sha1, (name_offset, orig_size), (content_type_id,), meta, (rid,) in zip(
+                resource_sha1_entries, resource_entries, content_type_ids, metas, rids
             )
-            for i in range(header.resources)
         ]
 
-        # Parse additional resource information
-        for resource in self.resources:
-            resource.content_type_id = unpack(">I", bundle.read(4))[0]
+        # Parse chunk entries that provide an ID instead of a name, the entry layout matches
+        # the leading arguments of Chunk so they are passed positionally
+        chunk_entries = CHUNK_ENTRY.iter_unpack(view[pos:pos + 24 * header.chunks])
+        pos += 24 * header.chunks
 
-        for resource in self.resources:
-            resource.meta = bundle.read(16)
-
-        for resource in self.resources:
-            resource.rid = unpack(">Q", bundle.read(8))[0]
-
-        # Parse chunk entries that provide an ID instead of a name
         self.chunks = [
-            Chunk(
-                sha1=sha1_entries[len(self.ebx) + len(self.resources) + i],
-                uid=bundle.read(16),
-                range_start=unpack(">H", bundle.read(2))[0],
-                logical_size=unpack(">H", bundle.read(2))[0],
-                logical_offset=unpack(">I", bundle.read(4))[0],
-            )
-            for i in range(header.chunks)
+            Chunk(*entry, sha1=sha1) for sha1, entry in zip(chunk_sha1_entries, chunk_entries)
         ]
 
         # Parse additional chunk meta data if available
         if header.chunks > 0:
-            toc_entry = TocEntry()
-            toc_entry.add_field(bundle)
-            chunk_meta = toc_entry.get('chunkMeta')
+            h32s, first_mips = self.read_chunk_meta(data, pos)
         else:
-            chunk_meta = []
+            h32s, first_mips = [], []
 
         # Create a combined list of all entries
         self.files.extend(self.ebx)
@@ -147,34 +183,45 @@ class SBBundle:
         if header.total == 0:
             return
 
-        # Parse the payload section that contains the CAS identifiers and offsets
-        bundle.seek(meta_offset + meta_size)
-        cas_id = unpack(">I", bundle.read(4))[0]
-        for file in self.files:
-            cas_id, addr = self.read_entry(cas_id, bundle)
+        # Parse the payload section that contains the CAS identifiers, offsets and sizes,
+        # all of them are 32 bit values so the section is unpacked at once
+        pos = meta_offset + meta_size
+        words = Struct(">{}I".format(max(bundle_len - pos, 0) // 4)).unpack_from(data, pos)
 
-            entry_cas = self.index.package.get_cas(cas_id)
+        # The CAS file of the current identifier is kept, it only changes for some entries
+        cas_id = words[0]
+        entry_cas = self.index.package.get_cas(cas_id)
+        idx = 1
+        for file in self.files:
+            cas_id, entry_cas, addr, idx = self.read_entry(cas_id, entry_cas, words, idx)
             if not entry_cas:
                 raise Exception("CAS instance for CAS identifier 0x{:x} not found".format(cas_id))
 
             file.offset = addr
-            file.size = unpack(">I", bundle.read(4))[0]
+            file.size = words[idx]
             file.cas = entry_cas
+            idx += 1
+
+        pos += 4 * idx
 
         # Parse more additional chunk meta data
-        for chunk_idx, chunk in enumerate(self.chunks):
-            chunk.h32 = chunk_meta[chunk_idx].h32
-            chunk.first_mip = chunk_meta[chunk_idx].meta.get('firstMip')
+        if len(h32s) < header.chunks:
+            raise Exception("Bundle contains less chunk meta entries than chunks")
+
+        for chunk, h32, first_mip in zip(self.chunks, h32s, first_mips):
+            chunk.h32 = h32
+            chunk.first_mip = first_mip
 
         # Make sure we parsed until the end of the payload
-        if bundle.tell() - offset != bundle_len:
+        if pos != bundle_len:
             # Fix for an edge case that occurs once with the demo build
-            if bundle_len - (bundle.tell() - offset) == 8:
-                LOG.warning("Ignoring unexpected bytes: 0x%x", unpack(">Q", bundle.read(8))[0])
+            if bundle_len - pos == 8:
+                LOG.warning("Ignoring unexpected bytes: 0x%x", U64_BE.unpack_from(data, pos)[0])
             else:
                 raise Exception("Payload parsing error, check read_entry calls")
 
-    def read_entry(self, cas_id: int, bundle: BinaryIO) -> Tuple[int, int]:
+    def read_entry(self, cas_id: int, cas: Optional[Cas], words: Tuple[int, ...],
+                   idx: int) -> Tuple[int, Optional[Cas], int, int]:
         """
         An entry exists of an offset but might also be prefixed with a CAS identifier.
         This seems a bit weird and we cannot figure out when to expect one or the other.
@@ -183,18 +230,123 @@ class SBBundle:
         and if so, perform an additional check to get rid of false positives (offsets that
         also pass validation). The second check is not completely reliable but appears to
         work fine in practice.
+
+        Returns the CAS identifier and its CAS file, the offset and the index of the word
+        after the entry.
         """
-        addr = unpack(">I", bundle.read(4))[0]
+        addr = words[idx]
 
         # Check if addr could be a valid cas identifier
-        cas = self.index.package.get_cas(addr)
-        if cas:
+        addr_cas = self.index.package.get_cas(addr)
+        if addr_cas:
             # Check if the addr is a valid entry in the previous cas
-            prev_cas = self.index.package.get_cas(cas_id)
-            if prev_cas and not prev_cas.has_file_at(addr):
-                return addr, unpack(">I", bundle.read(4))[0]
+            if cas and not cas.has_file_at(addr):
+                return addr, addr_cas, words[idx + 1], idx + 2
+
+        return cas_id, cas, addr, idx + 1
+
+    @staticmethod
+    def read_chunk_meta(data: bytes, pos: int) -> Tuple[List[int], List[Optional[int]]]:
+        """
+        Read the h32 and firstMip values of the chunk meta list at the given position.
+        Only these two values are used, so they are read straight into two lists instead
+        of creating a TocEntry for every entry. Other fields are read and discarded.
+        """
+        if data[pos] != 0x01:
+            raise Exception("Expected chunk meta list at 0x{:x}".format(pos))
+
+        _, pos = ReadUtil.unpack_string(data, pos + 1)
+        list_size, pos = ReadUtil.unpack_leb(data, pos)
+        list_end = pos + list_size - 1
+
+        h32s: List[int] = []
+        first_mips: List[Optional[int]] = []
+        while pos < list_end:
+            entry_offset = pos
+            item_type = data[pos]
+            if item_type == 0x02:
+                _, pos = ReadUtil.unpack_string(data, pos + 1)
+            elif item_type == 0x82:
+                pos += 1
+            else:
+                raise Exception("Chunk meta entry type 0x{:x} at 0x{:x} not recognized".format(
+                    item_type, pos
+                ))
+
+            entry_size, pos = ReadUtil.unpack_leb(data, pos)
+            entry_end = pos + entry_size
+
+            h32 = None
+            first_mip = None
+            while pos < entry_end:
+                field_type, key, offset, pos = SBBundle.read_field_key(data, pos)
+                if field_type == 0x00:
+                    continue
+
+                # The meta entry is scanned for firstMip rather than parsed as a whole
+                if field_type == 0x02 and key == 'meta':
+                    meta_size, pos = ReadUtil.unpack_leb(data, pos)
+                    meta_end = pos + meta_size
+                    while pos < meta_end:
+                        field_type, key, offset, pos = SBBundle.read_field_key(data, pos)
+                        if field_type != 0x00:
+                            value, pos = FIELD_READERS[field_type](data, pos, offset)
+                            if key == 'firstMip':
+                                first_mip = value
+                else:
+                    value, pos = FIELD_READERS[field_type](data, pos, offset)
+                    if key == 'h32':
+                        h32 = value
+
+            if h32 is None:
+                raise Exception("Chunk meta entry at 0x{:x} has no h32".format(entry_offset))
+
+            h32s.append(h32)
+            first_mips.append(first_mip)
+
+        if data[pos:pos + 1] != b'\x00':
+            raise Exception("Expected list at 0x{:x} to end with 0x00".format(pos + 1))
+
+        return h32s, first_mips
+
+    @staticmethod
+    def read_field_key(data: bytes, pos: int) -> Tuple[int, Optional[str], int, int]:
+        """
+        Read the type and key of the TOC field at the given position.
+        Returns the type, the key, the offset of the field and the position of its value.
+        The key is None for the null byte that ends an entry.
+        """
+        field_type = data[pos]
+        if field_type == 0x00:
+            return field_type, None, pos, pos + 1
 
-        return cas_id, addr
+        if field_type not in FIELD_READERS:
+            raise Exception("Unknown field data type 0x{:x} at 0x{:x}".format(field_type, pos))
+
+        key, value_pos = ReadUtil.unpack_string(data, pos + 1)
+        return field_type, key, pos, value_pos
+
+    @staticmethod
+    def read_string_table(data: bytes, start: int, end: int) -> Dict[int, str]:
+        """
+        Decode the null terminated strings between start and end in a single pass.
+        Returns the strings by their offset relative to start, strings that could
+        not be decoded are left out.
+        """
+        strings: Dict[int, str] = {}
+
+        pos = start
+        while True:
+            string_end = data.find(b'\x00', pos, end)
+            if string_end == -1:
+                return strings
+
+            try:
+                strings[pos - start] = data[pos:string_end].decode('utf-8')
+            except UnicodeDecodeError:
+                pass
+
+            pos = string_end + 1
 
     def __repr__(self) -> str:
         return self.name if self.name else 'Unknown'
@@ -204,12 +356,10 @@ class Header:
     """
     Header for SBBundle.
     """
+
+    __slots__ = ('magic', 'total', 'ebx', 'resources', 'chunks', 'string_offset',
+                 'chunk_meta_offset', 'chunk_meta_size')
+
     def __init__(self, values: Tuple[Any, ...]):
-        self.magic = values[0]
-        self.total = values[1]
-        self.ebx = values[2]
-        self.resources = values[3]
-        self.chunks = values[4]
-        self.string_offset = values[5]
-        self.chunk_meta_offset = values[6]
-        self.chunk_meta_size = values[7]
+        (self.magic, self.total, self.ebx, self.resources, self.chunks, self.string_offset,
+         self.chunk_meta_offset, self.chunk_meta_size) = values
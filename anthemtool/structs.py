@@ -0,0 +1,11 @@
+from struct import Struct
+
+
+# Precompiled structs for the primitive values that are read from the game files,
+# format specific layouts are defined next to the code that parses them
+U16_BE = Struct(">H")
+U32_BE = Struct(">I")
+U64_BE = Struct(">Q")
+
+U32_LE = Struct("<I")
+U64_LE = Struct("<Q")
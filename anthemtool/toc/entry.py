@@ -1,7 +1,7 @@
 import logging
-from struct import unpack
-from typing import BinaryIO, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
+from anthemtool.structs import U32_LE, U64_BE, U64_LE
 from anthemtool.util import ReadUtil
 
 
@@ -11,86 +11,178 @@ LOG = logging.getLogger(__name__)
 class TocEntry:
     """
     Represents a single entry that is read from a TOC file.
+    Entries are parsed from an in-memory buffer, all read methods take the position to read
+    from and return the position after the data they consumed.
     """
 
-    def __init__(self, handle: Optional[BinaryIO] = None) -> None:
+    def __init__(self, data: Optional[bytes] = None, pos: int = 0) -> None:
         """
-        Initialize instance and start reading if we got a file handle.
+        Initialize instance and start reading if we got a buffer.
         """
-        if handle:
-            self.read(handle)
+        # Fields are kept in a plain dict, this is faster than storing them as attributes
+        self.fields: Dict[str, Any] = {}
 
-    def read(self, handle: BinaryIO) -> None:
+        if data is not None:
+            self.read(data, pos)
+
+    def read(self, data: bytes, pos: int) -> int:
         """
-        Read the entry from the given file handle.
+        Read the entry from the given buffer at the given position.
         """
-        item_type = handle.read(1)
-        if item_type in (b'\x82', b'\x02'):
-            if item_type == b'\x02':
-                ReadUtil.read_string(handle)
-            item_size = ReadUtil.read_leb(handle)
-            item_offset = handle.tell()
-            while handle.tell() - item_offset < item_size:
-                self.add_field(handle)
-        elif item_type == b'\x87':
-            vars(self)['data'] = handle.read(ReadUtil.read_leb(handle) - 1)
-            if handle.read(1) != b'\x00':
-                raise Exception(
-                    "Expected TocEntry at offset 0x{:x} to end with 0x00".format(handle.tell())
-                )
-        elif item_type == b'\x8f':
-            vars(self)['data'] = handle.read(16)
+        item_type = data[pos]
+        pos += 1
+
+        if item_type in (0x82, 0x02):
+            if item_type == 0x02:
+                _, pos = ReadUtil.unpack_string(data, pos)
+            item_size, pos = ReadUtil.unpack_leb(data, pos)
+            item_end = pos + item_size
+            while pos < item_end:
+                pos = self.add_field(data, pos)
+        elif item_type == 0x87:
+            size, pos = ReadUtil.unpack_leb(data, pos)
+            self.fields['data'] = data[pos:pos + size - 1]
+            pos += size
+            if data[pos - 1:pos] != b'\x00':
+                raise Exception("Expected TocEntry at offset 0x{:x} to end with 0x00".format(pos))
+        elif item_type == 0x8f:
+            self.fields['data'] = data[pos:pos + 16]
+            pos += 16
         else:
             raise Exception(
-                "Item type 0x{:x} at offset 0x{:x} not recognized".format(item_type, handle.tell())
+                "Item type 0x{:x} at offset 0x{:x} not recognized".format(item_type, pos)
             )
 
-    def add_field(self, handle: BinaryIO) -> None:
+        return pos
+
+    def add_field(self, data: bytes, pos: int) -> int:
         """
-        Read one field from the given file handle.
+        Read one field from the given buffer at the given position.
         """
-        offset = handle.tell()
-        field_type = handle.read(1)
-        if field_type == b'\x00':
-            return
-
-        key = ReadUtil.read_string(handle)
-        if field_type == b'\x0f':
-            vars(self)[key] = handle.read(16)
-        elif field_type == b'\x09':
-            vars(self)[key] = unpack("Q", handle.read(8))[0]
-        elif field_type == b'\x08':
-            vars(self)[key] = unpack("I", handle.read(4))[0]
-        elif field_type == b'\x06':
-            vars(self)[key] = handle.read(1) == b'\x01'
-        elif field_type == b'\x02':
-            handle.seek(offset, 0)
-            vars(self)[key] = TocEntry(handle)
-        elif field_type == b'\x13':
-            vars(self)[key] = handle.read(ReadUtil.read_leb(handle))
-        elif field_type == b'\x10':
-            vars(self)[key] = handle.read(20)
-        elif field_type == b'\x07':
-            vars(self)[key] = handle.read(ReadUtil.read_leb(handle) - 1).decode('utf-8')
-            handle.seek(1, 1)
-        elif field_type == b'\x0c':
-            vars(self)[key] = unpack(">Q", handle.read(8))[0]
-        elif field_type == b'\x01':
-            result = []
-            list_size = ReadUtil.read_leb(handle)
-            list_offset = handle.tell()
-            while handle.tell() - list_offset < list_size - 1:
-                result.append(TocEntry(handle))
-            vars(self)[key] = result
-            if handle.read(1) != b'\x00':
-                raise Exception("Expected list at 0x{:x} to end with 0x00".format(handle.tell()))
-        else:
-            raise Exception(
-                "Unknown field data type 0x{:x} at 0x{:x}".format(field_type, handle.tell())
-            )
+        offset = pos
+        field_type = data[pos]
+        pos += 1
+        if field_type == 0x00:
+            return pos
+
+        key, pos = ReadUtil.unpack_string(data, pos)
+        reader = FIELD_READERS.get(field_type)
+        if reader is None:
+            raise Exception("Unknown field data type 0x{:x} at 0x{:x}".format(field_type, pos))
+
+        self.fields[key], pos = reader(data, pos, offset)
+        return pos
 
     def get(self, key: str) -> Any:
         """
         Return the member attribute value for the given key, or None if it does not exist.
         """
-        return vars(self).get(key)
+        return self.fields.get(key)
+
+    def __getattr__(self, key: str) -> Any:
+        """
+        Provide attribute access to the fields, only called when regular lookup fails.
+        """
+        try:
+            return self.__dict__['fields'][key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+
+def read_guid(data: bytes, pos: int, offset: int) -> Tuple[bytes, int]:
+    """
+    Read a 16 byte GUID.
+    """
+    return data[pos:pos + 16], pos + 16
+
+
+def read_u64(data: bytes, pos: int, offset: int) -> Tuple[int, int]:
+    """
+    Read a little endian 64 bit integer.
+    """
+    return U64_LE.unpack_from(data, pos)[0], pos + 8
+
+
+def read_u32(data: bytes, pos: int, offset: int) -> Tuple[int, int]:
+    """
+    Read a little endian 32 bit integer.
+    """
+    return U32_LE.unpack_from(data, pos)[0], pos + 4
+
+
+def read_bool(data: bytes, pos: int, offset: int) -> Tuple[bool, int]:
+    """
+    Read a boolean.
+    """
+    return data[pos:pos + 1] == b'\x01', pos + 1
+
+
+def read_entry(data: bytes, pos: int, offset: int) -> Tuple[TocEntry, int]:
+    """
+    Read a nested entry, these start with the field type and key so read from the field offset.
+    """
+    entry = TocEntry()
+    return entry, entry.read(data, offset)
+
+
+def read_blob(data: bytes, pos: int, offset: int) -> Tuple[bytes, int]:
+    """
+    Read a blob prefixed with its size.
+    """
+    size, pos = ReadUtil.unpack_leb(data, pos)
+    return data[pos:pos + size], pos + size
+
+
+def read_sha1(data: bytes, pos: int, offset: int) -> Tuple[bytes, int]:
+    """
+    Read a 20 byte SHA1 hash.
+    """
+    return data[pos:pos + 20], pos + 20
+
+
+def read_str(data: bytes, pos: int, offset: int) -> Tuple[str, int]:
+    """
+    Read a null terminated string prefixed with its size.
+    """
+    size, pos = ReadUtil.unpack_leb(data, pos)
+    return data[pos:pos + size - 1].decode('utf-8'), pos + size
+
+
+def read_u64_be(data: bytes, pos: int, offset: int) -> Tuple[int, int]:
+    """
+    Read a big endian 64 bit integer.
+    """
+    return U64_BE.unpack_from(data, pos)[0], pos + 8
+
+
+def read_list(data: bytes, pos: int, offset: int) -> Tuple[List[TocEntry], int]:
+    """
+    Read a list of entries.
+    """
+    result = []
+    list_size, pos = ReadUtil.unpack_leb(data, pos)
+    list_end = pos + list_size - 1
+    while pos < list_end:
+        entry = TocEntry()
+        pos = entry.read(data, pos)
+        result.append(entry)
+
+    if data[pos:pos + 1] != b'\x00':
+        raise Exception("Expected list at 0x{:x} to end with 0x00".format(pos + 1))
+
+    return result, pos + 1
+
+
+# Reader for the value of each field data type, a lookup is cheaper than a chain of comparisons
+FIELD_READERS: Dict[int, Callable[[bytes, int, int], Tuple[Any, int]]] = {
+    0x0f: read_guid,
+    0x09: read_u64,
+    0x08: read_u32,
+    0x06: read_bool,
+    0x02: read_entry,
+    0x13: read_blob,
+    0x10: read_sha1,
+    0x07: read_str,
+    0x0c: read_u64_be,
+    0x01: read_list,
+}
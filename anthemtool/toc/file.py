@@ -1,7 +1,7 @@
 import logging
-from io import BytesIO
-from struct import unpack
-from typing import BinaryIO, Optional
+from typing import Optional
+
+from anthemtool.structs import U32_BE
 
 
 LOG = logging.getLogger(__name__)
@@ -19,7 +19,7 @@ class TocFile:
         self.path: str = path
 
         # Local entries
-        self.data: Optional[BinaryIO] = None
+        self.data: Optional[bytes] = None
 
         # Load the data
         self.read()
@@ -31,9 +31,9 @@ class TocFile:
         """
         LOG.debug("Reading TocIndex %s", self.path)
         with open(self.path, "rb") as handle:
-            magic = unpack(">I", handle.read(4))[0]
+            magic = U32_BE.unpack(handle.read(4))[0]
             if magic != 0x00D1CE01:
                 raise Exception("Expected TocIndex magic 0x00D1CE01 but got 0x{:x}".format(magic))
 
             handle.seek(0x22C)
-            self.data = BytesIO(handle.read())
+            self.data = handle.read()
@@ -1,9 +1,10 @@
 import logging
-from struct import unpack
+from struct import Struct
 from typing import BinaryIO, List, TYPE_CHECKING
 
 from anthemtool.cas.resource import File, TocResource
 from anthemtool.sb.bundle import SBBundle
+from anthemtool.structs import U32_BE
 from anthemtool.util import ReadUtil
 
 if TYPE_CHECKING:
@@ -12,6 +13,18 @@ if TYPE_CHECKING:
 
 LOG = logging.getLogger(__name__)
 
+# Length, counts and section offsets that follow the magic
+INDEX_HEADER = Struct(">10I")
+
+# Name offset, size, unknown and superbundle offset of bundles
+BUNDLE_ENTRY = Struct(">4I")
+
+# Identifier, unknown and order of resources
+RESOURCE_ENTRY = Struct(">16sHH")
+
+# CAS identifier, offset and size of resources
+LOCATION_ENTRY = Struct(">3I")
+
 
 class TocIndex:
     """
@@ -38,21 +51,17 @@ class TocIndex:
         Read from the given TocFile file handle and parse it.
         During parsing some extra checks make sure the parsing is performed correctly.
         """
-        magic = unpack(">I", handle.read(4))[0]
+        magic = U32_BE.unpack(handle.read(4))[0]
         if magic != 0x30:
             raise Exception("Expected TocIndex magic 0x30 but got 0x{:x}".format(magic))
 
         # Parse container meta data
-        handle.read(4)  # length
-        item_count = unpack(">I", handle.read(4))[0]
-        offset1 = unpack(">I", handle.read(4))[0]
-        offset2 = unpack(">I", handle.read(4))[0]
-        res_count = unpack(">I", handle.read(4))[0]
-        offset4 = unpack(">I", handle.read(4))[0]
-        offset5 = unpack(">I", handle.read(4))[0]
-        offset6 = unpack(">I", handle.read(4))[0]
-        handle.read(4)  # offset 7
-        handle.read(4)  # sec4_size
+        (
+            _,  # length
+            item_count, offset1, offset2, res_count, offset4, offset5, offset6,
+            _,  # offset 7
+            _,  # sec4_size
+        ) = INDEX_HEADER.unpack(handle.read(INDEX_HEADER.size))
 
         if item_count == 0:
             LOG.debug("TocIndex contains no bundles")
@@ -61,41 +70,40 @@ class TocIndex:
         LOG.debug("TocIndex contains %d items", item_count)
 
         # Ref for each bundle (appear to be some kind of flags?)
-        bundle_refs = [unpack(">I", handle.read(4))[0] for i in range(item_count)]
+        bundle_refs = [ref for ref, in U32_BE.iter_unpack(handle.read(4 * item_count))]
 
-        # Alignment
-        handle.read(4)
-        while handle.tell() % 8 != 0:
-            handle.read(1)
+        # Alignment, skip a word and move to the next multiple of 8
+        handle.seek(4, 1)
+        handle.seek(-handle.tell() % 8, 1)
 
         # Process bundles
-        for ref in bundle_refs:
-            string_off = unpack(">I", handle.read(4))[0]
-            size = unpack(">I", handle.read(4))[0]
-            handle.read(4)  # unknown
-            offset = unpack(">I", handle.read(4))[0]
+        bundle_entries = BUNDLE_ENTRY.iter_unpack(handle.read(BUNDLE_ENTRY.size * item_count))
+        for ref, (string_off, size, _, offset) in zip(bundle_refs, bundle_entries):
             name = ReadUtil.read_string_rewind(handle, offset6 + string_off)
 
             self.bundles.append(
                 SBBundle(self, bundle, offset, name, size, ref=ref)
             )
 
-        # Read bundle resources
-        res = []
+        # Read bundle resources flags
         handle.seek(offset1)
-        for idx in range(0, res_count):
-            res.append({"flags": unpack(">I", handle.read(4))[0]})
+        flags = [res_flags for res_flags, in U32_BE.iter_unpack(handle.read(4 * res_count))]
 
         if handle.tell() != offset2:
             raise Exception("Toc parsing failed, expected offset2")
 
         # Read bundle resources sha1 entries
-        for idx in range(0, res_count):
-            res[idx]['uid'] = handle.read(16)
-            res[idx]['unknown'] = unpack(">H", handle.read(2))[0]
-            res[idx]['order'] = unpack(">H", handle.read(2))[0]
-
-        res = sorted(res, key=lambda x: x['order'])
+        uids = []
+        orders = []
+        resource_entries = RESOURCE_ENTRY.iter_unpack(handle.read(RESOURCE_ENTRY.size * res_count))
+        for uid, _, order in resource_entries:
+            uids.append(uid)
+            orders.append(order)
+
+        # Locations are stored by order, so rearrange the columns to match
+        order = sorted(range(0, res_count), key=orders.__getitem__)
+        flags = [flags[idx] for idx in order]
+        uids = [uids[idx] for idx in order]
 
         if handle.tell() != offset4:
             raise Exception("Toc parsing failed, expected offset4")
@@ -108,20 +116,17 @@ class TocIndex:
             raise Exception("Toc parsing failed, expected offset5")
 
         # Read bundle resources locations
-        for idx in range(0, res_count):
-            cas_id = unpack(">I", handle.read(4))[0]
-            offset = unpack(">I", handle.read(4))[0]
-            size = unpack(">I", handle.read(4))[0]
-
+        locations = LOCATION_ENTRY.iter_unpack(handle.read(LOCATION_ENTRY.size * res_count))
+        for uid, res_flags, (cas_id, offset, size) in zip(uids, flags, locations):
             cas = self.package.get_cas(cas_id)
             if not cas:
                 raise Exception("Could not find CAS entry for CAS identifier 0x{:x}".format(cas_id))
 
             self.resources.append(
                 TocResource(
-                    uid=res[idx]['uid'],
+                    uid=uid,
                     cas=cas,
-                    flags=res[idx]['flags'],
+                    flags=res_flags,
                     offset=offset,
                     size=size,
                 )
@@ -1,4 +1,3 @@
-import binascii
 import os
 import logging
 from typing import Dict, Optional, TYPE_CHECKING
@@ -46,7 +45,7 @@ class Layout:
         # Process install chunks
         source = TocEntry(TocFile(layout_path).data)
         for idx, chunk in enumerate(source.get('installManifest').get('installChunks')):
-            chunk_id = binascii.hexlify(chunk.id).decode('utf-8')
+            chunk_id = chunk.id.hex()
 
             LOG.debug(
                 "Processing install chunk id=0x%s name=%s bundle=%s",
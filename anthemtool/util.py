@@ -1,5 +1,5 @@
 import os
-from typing import BinaryIO
+from typing import BinaryIO, Set, Tuple
 
 
 class ReadUtil:
@@ -7,32 +7,65 @@ class ReadUtil:
     Utility class for stream reading operations.
     """
 
+    # Strings are read in blocks of this size while looking for the terminating null byte
+    STRING_BLOCK_SIZE = 64
+
     @staticmethod
-    def read_leb(handle: BinaryIO) -> int:
+    def unpack_leb(data: bytes, pos: int) -> Tuple[int, int]:
         """
-        Read an LEB128/7bit encoded integer.
+        Read an LEB128/7bit encoded integer from the given buffer at the given position.
+        Returns the integer and the position after it.
         """
-        result, i = 0, 0
+        byte = data[pos]
+        pos += 1
+
+        # Most lengths are small enough to fit in a single byte
+        if byte < 0x80:
+            return byte, pos
+
+        result, i = byte & 127, 7
         while True:
-            byte = ord(handle.read(1))
+            byte = data[pos]
+            pos += 1
             result |= (byte & 127) << i
-            if byte >> 7 == 0:
-                return result
+            if byte < 0x80:
+                return result, pos
             i += 7
 
+    @staticmethod
+    def unpack_string(data: bytes, pos: int, encoding: str = 'utf-8') -> Tuple[str, int]:
+        """
+        Read a string from the given buffer at the given position.
+        Returns the string and the position after the terminating null byte.
+        """
+        end = data.find(b'\x00', pos)
+        if end == -1:
+            raise Exception("Expected string to end with 0x00")
+
+        return data[pos:end].decode(encoding), end + 1
+
     @staticmethod
     def read_string(handle: BinaryIO, encoding: str = 'utf-8') -> str:
         """
         Read a string from the given file handle.
+        The handle is positioned right after the terminating null byte.
         """
-        result = b''
+        blocks = []
 
         while True:
-            value = handle.read(1)
-            if value == b'\x00':
-                return result.decode(encoding)
+            block = handle.read(ReadUtil.STRING_BLOCK_SIZE)
+            if not block:
+                raise Exception("Expected string to end with 0x00")
+
+            end = block.find(b'\x00')
+            if end != -1:
+                # Rewind the bytes we read past the end of the string
+                handle.seek(end + 1 - len(block), 1)
+                blocks.append(block[:end])
+
+                return b''.join(blocks).decode(encoding)
 
-            result += value
+            blocks.append(block)
 
     @staticmethod
     def read_string_rewind(handle: BinaryIO, offset: int, encoding: str = 'utf-8') -> str:
@@ -52,13 +85,22 @@ class PathUtil:
     Utility class for path operations.
     """
 
+    # Directories that are known to exist, most files are exported to a directory that exists
+    existing_paths: Set[str] = set()
+
     @staticmethod
     def ensure_path_exists(path: str) -> None:
         """
         Recursively create the directory structure for the given path if it does not exist.
         """
+        if path in PathUtil.existing_paths:
+            return
+
         if not os.path.exists(path):
-            os.makedirs(path)
+            # Another thread may create the same directory in the meantime
+            os.makedirs(path, exist_ok=True)
+
+        PathUtil.existing_paths.add(path)
 
     @staticmethod
     def ensure_base_path_exists(path: str) -> None:
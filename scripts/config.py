@@ -13,6 +13,10 @@ EXPORT_RESOURCES = True
 EXPORT_CHUNKS = True
 EXPORT_TOC_RESOURCES = True
 
+# Number of threads that export files in parallel, exporting is mostly waiting on disk I/O
+# so more threads than cores keeps the disks busy
+EXPORT_WORKERS = (os.cpu_count() or 1) * 2
+
 # Logging
 root = logging.getLogger()
 root.setLevel(logging.INFO)
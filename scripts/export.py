@@ -1,6 +1,7 @@
 import logging
 import os
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 
 from diskcache import Cache
 
@@ -48,6 +49,12 @@ class Exporter:
         self.path_chunks = os.path.join('bundle', 'chunks')
         self.path_toc_resources = 'chunks'
 
+        # Output files that exist, these are skipped on export
+        self.existing_paths: Set[str] = set()
+
+        # Thread pool that exports the items, created for the duration of an export
+        self.executor: Optional[ThreadPoolExecutor] = None
+
     def export(self) -> None:
         """
         Export the game files.
@@ -55,8 +62,17 @@ class Exporter:
         game = self.load_game()
 
         LOG.info("Starting export of files to %s", config.OUTPUT_FOLDER)
-        self.export_layout(game.layout_patch)
-        self.export_layout(game.layout_data)
+        self.existing_paths = self.get_existing_paths(config.OUTPUT_FOLDER)
+
+        # Reading, decompressing and writing release the GIL, so items are exported in parallel.
+        # A single pool is shared by all superbundles to avoid starting threads for each of them.
+        try:
+            with ThreadPoolExecutor(max_workers=config.EXPORT_WORKERS) as self.executor:
+                self.export_layout(game.layout_patch)
+                self.export_layout(game.layout_data)
+        finally:
+            self.executor = None
+
         LOG.info("Export completed successfully")
 
     def export_layout(self, layout: Layout) -> None:
@@ -79,26 +95,59 @@ class Exporter:
                 continue
 
             LOG.info("Exporting superbundle %s", name)
-            for bundle in index.bundles:
-                LOG.debug("Exporting bundle %s", bundle)
+            resources = self.get_resources(index)
+
+            # Export in CAS order so the CAS files are read sequentially
+            resources.sort(key=lambda entry: (
+                entry[0].cas.path if entry[0].cas else '', entry[0].offset or 0x0
+            ))
 
-                if config.EXPORT_EBX:
-                    for ebx in bundle.ebx:
-                        self.export_resource(ebx, os.path.join(self.path_ebx, ebx.filename))
+            if not self.executor:
+                raise Exception("Superbundles can only be exported during export()")
+
+            futures = [
+                self.executor.submit(self.export_resource, item, path) for item, path in resources
+            ]
+
+            # Wait for the superbundle to finish and raise the first exception that occurred,
+            # items that did not start yet are cancelled so the export stops right away
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def get_resources(self, index: TocIndex) -> List[Tuple[File, str]]:
+        """
+        Collect the items of the given superbundle that should be exported with their path.
+        Only the first item for each path is kept, as the others would be skipped on export.
+        """
+        groups: List[Tuple[str, List[File]]] = []
 
-                if config.EXPORT_RESOURCES:
-                    for resource in bundle.resources:
-                        self.export_resource(
-                            resource, os.path.join(self.path_resources, resource.filename)
-                        )
+        for bundle in index.bundles:
+            LOG.debug("Exporting bundle %s", bundle)
 
-                if config.EXPORT_CHUNKS:
-                    for chunk in bundle.chunks:
-                        self.export_resource(chunk, os.path.join(self.path_chunks, chunk.filename))
+            if config.EXPORT_EBX:
+                groups.append((self.path_ebx, bundle.ebx))
 
-            if config.EXPORT_TOC_RESOURCES:
-                for item in index.resources:
-                    self.export_resource(item, os.path.join(self.path_toc_resources, item.filename))
+            if config.EXPORT_RESOURCES:
+                groups.append((self.path_resources, bundle.resources))
+
+            if config.EXPORT_CHUNKS:
+                groups.append((self.path_chunks, bundle.chunks))
+
+        if config.EXPORT_TOC_RESOURCES:
+            groups.append((self.path_toc_resources, index.resources))
+
+        resources: Dict[str, Tuple[File, str]] = {}
+        for base_path, items in groups:
+            for item in items:
+                path = os.path.join(base_path, item.filename)
+                resources.setdefault(self.get_path_key(path), (item, path))
+
+        return list(resources.values())
 
     def export_resource(self, item: File, path: str) -> None:
         """
@@ -110,14 +159,35 @@ class Exporter:
         if item.offset is None or item.size is None:
             raise Exception("File {} is missing an offset or size".format(item))
 
-        path = os.path.join(config.OUTPUT_FOLDER, path)
-        if os.path.exists(path):
+        path = os.path.normpath(os.path.join(config.OUTPUT_FOLDER, path))
+        path_key = self.get_path_key(path)
+        if path_key in self.existing_paths:
             LOG.debug("Skipping existing file %s", path)
             return
 
         LOG.debug("Reading %s", item)
         LOG.debug("Writing %s", path)
         self.writer.write(item.cas, item.offset, path, item.size, item.orig_size)
+        self.existing_paths.add(path_key)
+
+    @staticmethod
+    def get_existing_paths(path: str) -> Set[str]:
+        """
+        Collect the path keys of all files below the given path.
+        A single walk over the output folder is a lot cheaper than a stat call for each item.
+        """
+        return {
+            Exporter.get_path_key(os.path.join(root, name))
+            for root, _, names in os.walk(path) for name in names
+        }
+
+    @staticmethod
+    def get_path_key(path: str) -> str:
+        """
+        Normalize the given path so paths that refer to the same file compare equal.
+        Names in bundles use forward slashes and Windows paths are case insensitive.
+        """
+        return os.path.normcase(os.path.normpath(path))
 
     def load_game(self) -> FrostbiteGame:
         """
@@ -132,7 +202,8 @@ class CacheExporter(Exporter):
     Exporter implementation that attempts to load the game from the cache.
     """
 
-    CACHE_KEY_GAME: str = "game"
+    # Bump the version whenever the pickled classes change, old entries cannot be loaded
+    CACHE_KEY_GAME: str = "game-v2"
 
     def __init__(self, cache_path: str) -> None:
         """